@@ -1,807 +1,1232 @@
-import os
-import sys
-import rasterio
-import psycopg2
-import geopandas as gpd
-import numpy as np
-from matplotlib.colors import Normalize
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
-from matplotlib.figure import Figure
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QMenu, QAction, QMessageBox, QDockWidget, QVBoxLayout,
-    QWidget, QCheckBox, QListWidget, QListWidgetItem, QFileDialog, QDialog, QLabel, 
-    QLineEdit, QPushButton, QFormLayout, QComboBox, QHBoxLayout
-)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QPixmap, QPainter, QBrush, QLinearGradient
-
-
-# Global variables
-app = QApplication(sys.argv)
-window = QMainWindow()
-layers = {}
-canvas = None
-tocListWidget = None
-
-
-def initUI():
-    global canvas, tocListWidget, tocDockWidget
-
-    # Main window setup
-    window.setWindowTitle('GeoSpyTia')
-    window.setGeometry(100, 100, 800, 600)
-
-    # Menu Bar
-    menubar = window.menuBar()
-
-    # File Menu
-    fileMenu = menubar.addMenu('File')
-    fileMenu.addAction(create_action('New', newFile))
-    fileMenu.addAction(create_action('Open', openFile))
-    fileMenu.addAction(create_action('Save', saveFile))
-    fileMenu.addAction(create_action('Connect To Database', connectToDatabase))
-    fileMenu.addAction(create_action('Exit', window.close))
-
-    # Geoprocessing Menu
-    geoprocessingMenu = menubar.addMenu('Geoprocessing')
-    geoprocessingMenu.addAction(create_action('Buffer', bufferDialog))
-    geoprocessingMenu.addAction(create_action('Clip', clipDialog))
-    geoprocessingMenu.addAction(create_action('Intersect', intersectDialog))
-
-    # Toolbox Menu
-    toolboxMenu = menubar.addMenu('Toolbox')
-    toolboxMenu.addAction(create_action('NDVI', ndviDialog))
-    toolboxMenu.addAction(create_action('NDBI', ndbiDialog))
-    toolboxMenu.addAction(create_action('LST', lstDialog))
-    toolboxMenu.addAction(create_action('Raster Overlay', rasterOverlayDialog))
-    
-
-
-
-    # Help Menu
-    helpMenu = menubar.addMenu('Help')
-    helpMenu.addAction(create_action('Read', showHelp))
-
-    # Toolbar
-    toolbar = window.addToolBar('Toolbar')
-    toolbar.addAction(create_action_with_icon('New', 'icons/newfile.png', newFile))
-    toolbar.addAction(create_action_with_icon('Open', 'icons/openfolder.png', openFile))
-    toolbar.addAction(create_action_with_icon('Save', 'icons/save.png', saveFile))
-    toolbar.addAction(create_action_with_icon('Zoom In', 'icons/zoomin.png', zoomIn))
-    toolbar.addAction(create_action_with_icon('Zoom Out', 'icons/zoomout.png', zoomOut))
-    
-    
-    # Create the "Add Data" dropdown menu
-    addDataMenu = QMenu(window)
-    addDataMenu.addAction(create_action('Load Data', openFile))
-    addDataMenu.addAction(create_action('From Database', importFromDatabase))
-
-    # Create the "Add Data" toolbar action with the dropdown menu
-    addDataAction = QAction(QIcon('icons/adddata.png'), '', window)
-    addDataAction.setMenu(addDataMenu)
-
-    # Add the action to the toolbar
-    toolbar.addAction(addDataAction)
-
-    toolbar.addAction(create_action_with_icon('TOC', 'icons/toc.png', toggleTOC))
-    toolbar.addAction(create_action_with_icon('Pan', 'icons/navigation.png', navPan))
-
-
-    # TOC (Table of Contents)
-    tocDockWidget = QDockWidget("Table of Contents", window)
-    tocListWidget = QListWidget()
-    tocDockWidget.setWidget(tocListWidget)
-    window.addDockWidget(Qt.LeftDockWidgetArea, tocDockWidget)
-    tocListWidget.setContextMenuPolicy(Qt.CustomContextMenu)
-    tocListWidget.customContextMenuRequested.connect(showContextMenu)
-
-    # Canvas for map display
-    canvas = FigureCanvas(Figure())
-    centralWidget = QWidget()
-    layout = QVBoxLayout()
-    layout.addWidget(canvas)
-    centralWidget.setLayout(layout)
-    window.setCentralWidget(centralWidget)
-
-    # Show window
-    window.show()
-
-def toggleTOC():
-    if tocDockWidget.isHidden():
-        tocDockWidget.show()
-    
-
-def addData():
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Add Data")
-
-    layout = QFormLayout(dialog)
-
-    # Data source selection
-    sourceLabel = QLabel("Data Source:")
-    sourceComboBox = QComboBox()
-    sourceComboBox.addItems(["Raster", "Vector"])
-    layout.addRow(sourceLabel, sourceComboBox)
-
-    # File selection
-    fileLabel = QLabel("File:")
-    fileLineEdit = QLineEdit()
-    fileBrowseButton = QPushButton("Browse")
-    fileBrowseButton.clicked.connect(lambda: browseFile(fileLineEdit, 'All Files (*)'))
-    layout.addRow(fileLabel, fileLineEdit)
-    layout.addRow("", fileBrowseButton)
-
-    # Import button
-    importButton = QPushButton("Import")
-    importButton.clicked.connect(lambda: importData(sourceComboBox.currentText(), fileLineEdit.text()))
-    
-    layout.addRow("", importButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def importData(dataType, filePath):
-    if dataType == "Raster":
-        loadRaster(filePath)
-    elif dataType == "Vector":
-        loadVector(filePath)
-    else:
-        QMessageBox.warning(window, 'Unsupported Data Type', 'Unsupported data type selected!')
-
-
-def create_action(name, func):
-    action = QAction(name, window)
-    action.triggered.connect(func)
-    return action
-
-
-def create_action_with_icon(name, icon_path, func):
-    action = QAction(QIcon(icon_path), name, window)
-    action.triggered.connect(func)
-    return action
-
-
-def newFile():
-    global layers
-    reply = QMessageBox.question(window, 'New File', 'Are you sure you want to create a new file? Unsaved changes will be lost.', QMessageBox.Yes | QMessageBox.No)
-    if reply == QMessageBox.No:
-        return
-    tocListWidget.clear()
-    layers.clear()
-    updateDisplay()
-    QMessageBox.information(window, 'New File', 'New file created!')
-
-
-def openFile():
-    filePath, _ = QFileDialog.getOpenFileName(window, 'Open File', '', 
-                                              'Raster Files (*.tif *.tiff *.img);;Vector Files (*.shp);;All Files (*)')
-    if filePath:
-        if filePath.endswith(('.tif', '.tiff', '.img')):
-            loadRaster(filePath)
-        elif filePath.endswith('.shp'):
-            loadVector(filePath)
-        else:
-            QMessageBox.warning(window, 'Unsupported Format', 'Unsupported file format!')
-
-
-def saveFile():
-    filePath, _ = QFileDialog.getSaveFileName(window, 'Save File', '', 
-                                              'Raster Files (*.tif *.tiff *.img);;Vector Files (*.shp);;All Files (*)')
-    if filePath:
-        try:
-            for layer_data in layers.values():
-                if layer_data['type'] == 'raster':
-                    np.save(filePath, layer_data['data'])
-                elif layer_data['type'] == 'vector':
-                    layer_data['data'].to_file(filePath)
-            QMessageBox.information(window, 'Save File', 'File saved successfully!')
-        except Exception as e:
-            QMessageBox.critical(window, 'Save File', f'Failed to save file: {e}')
-
-
-def loadRaster(filePath):
-    global layers
-    with rasterio.open(filePath) as src:
-        data = src.read(1)
-        layers[os.path.basename(filePath)] = {'type': 'raster', 'data': data}
-        updateTOC()
-
-
-def loadVector(filePath):
-    global layers
-    gdf = gpd.read_file(filePath)
-    layers[os.path.basename(filePath)] = {'type': 'vector', 'data': gdf}
-    updateTOC()
-
-
-
-
-def updateTOC():
-    tocListWidget.clear()
-    for layer_name, layer_data in layers.items():
-        # Create a list widget item
-        item = QListWidgetItem()
-
-        # Create a custom widget to hold the checkbox, legend, and layer name
-        widget = QWidget()
-        layout = QHBoxLayout()
-
-        # Create a checkbox to toggle layer visibility
-        checkbox = QCheckBox(layer_name)
-        checkbox.setChecked(True)
-        checkbox.stateChanged.connect(lambda state, name=layer_name: toggleLayer(state, name))
-        layout.addWidget(checkbox)
-
-        # Add a color legend
-        colorLabel = QLabel()
-        colorLabel.setFixedSize(100, 20)  # Adjust size for better visibility
-
-        if layer_data['type'] == 'raster':
-            # Create a gradient pixmap for raster
-            pixmap = QPixmap(colorLabel.size())
-            pixmap.fill(Qt.transparent)
-            painter = QPainter(pixmap)
-            gradient = QLinearGradient(0, 0, colorLabel.width(), 0)
-            gradient.setColorAt(0.0, Qt.red)
-            gradient.setColorAt(0.33, Qt.yellow)
-            gradient.setColorAt(0.66, Qt.green)
-            gradient.setColorAt(1.0, Qt.blue)
-            painter.fillRect(pixmap.rect(), QBrush(gradient))
-            painter.end()
-            colorLabel.setPixmap(pixmap)
-
-        elif layer_data['type'] == 'vector':
-            # Use a solid color for vector legend
-            colorLabel.setStyleSheet("background-color: blue;")
-
-        layout.addWidget(colorLabel)
-
-        # Ensure alignment and spacing are neat
-        layout.setAlignment(Qt.AlignLeft)
-        layout.setContentsMargins(5, 2, 5, 2)
-        layout.setSpacing(5)
-
-        widget.setLayout(layout)
-
-        # Add the widget to the TOC list
-        tocListWidget.addItem(item)
-        tocListWidget.setItemWidget(item, widget)
-
-    updateDisplay()
-
-
-
-def showContextMenu(pos):
-    contextMenu = QMenu(window)
-    removeLayerAct = QAction('Remove Layer', window)
-    removeLayerAct.triggered.connect(removeLayer)
-    contextMenu.addAction(removeLayerAct)
-    contextMenu.exec_(tocListWidget.mapToGlobal(pos))
-
-def removeLayer():
-    currentRow = tocListWidget.currentRow()
-    if currentRow >= 0:
-        item = tocListWidget.takeItem(currentRow)
-        layerName = item.text()
-        if layerName in layers:
-            del layers[layerName]
-
-        # Clear the map display
-        updateDisplay()
-        QMessageBox.information(window, 'Remove Layer', 'Layer removed successfully!')
-
-
-def toggleLayer(state, layerName):
-    updateDisplay()
-
-
-def updateDisplay():
-    ax = canvas.figure.gca()
-    ax.clear()
-    norm = Normalize()
-
-    for item_index in range(tocListWidget.count() - 1, -1, -1):  # Iterate from topmost to bottom
-        item = tocListWidget.item(item_index)
-        widget = tocListWidget.itemWidget(item)
-        checkbox = widget.findChild(QCheckBox)
-        layer_name = checkbox.text()
-        if checkbox.isChecked() and layer_name in layers:
-            layer = layers[layer_name]
-            if layer['type'] == 'raster':
-                im = ax.imshow(layer['data'], cmap='Spectral', norm=norm)
-                # Add color bar
-                if not hasattr(canvas, 'cbar'):
-                    canvas.cbar = canvas.figure.colorbar(im, ax=ax, orientation='vertical')
-                else:
-                    canvas.cbar.update_normal(im)
-                canvas.cbar.set_label('Value')
-            elif layer['type'] == 'vector':
-                layer['data'].plot(ax=ax, edgecolor='blue', facecolor='none')
-            break  # Display only the uppermost checked layer
-
-    ax.set_aspect('equal')
-    ax.axis('off')
-    canvas.draw()
-
-
-
-def navPan():
-    if not hasattr(window, 'nav_toolbar'):
-        window.nav_toolbar = NavigationToolbar2QT(canvas, window)
-        window.addToolBar(window.nav_toolbar)
-    if window.nav_toolbar.isVisible():
-        window.nav_toolbar.hide()
-    else:
-        window.nav_toolbar.show()
-    window.nav_toolbar.pan()
-    canvas.draw()
-
-
-def wheelEvent(event):
-    ax = canvas.figure.gca()
-    xlim = ax.get_xlim()
-    ylim = ax.get_ylim()
-    
-    # Get the mouse position in data coordinates
-    xdata = event.pos().x()
-    ydata = event.pos().y()
-    inv = ax.transData.inverted()
-    xdata, ydata = inv.transform((xdata, ydata))
-    
-    # Calculate zoom factor
-    zoom_factor = 0.1
-    if event.angleDelta().y() > 0:
-        scale_factor = 1 - zoom_factor
-    else:
-        scale_factor = 1 + zoom_factor
-    
-    # Adjust the limits based on the mouse position
-    new_xlim = [xdata - (xdata - xlim[0]) * scale_factor, xdata + (xlim[1] - xdata) * scale_factor]
-    new_ylim = [ydata - (ydata - ylim[0]) * scale_factor, ydata + (ylim[1] - ydata) * scale_factor]
-    
-    ax.set_xlim(new_xlim)
-    ax.set_ylim(new_ylim)
-    canvas.draw()
-
-window.wheelEvent = wheelEvent
-
-
-
-def zoomIn():
-    ax = canvas.figure.gca()
-    xlim = ax.get_xlim()
-    ylim = ax.get_ylim()
-    ax.set_xlim([xlim[0] + (xlim[1] - xlim[0]) * 0.1, xlim[1] - (xlim[1] - xlim[0]) * 0.1])
-    ax.set_ylim([ylim[0] + (ylim[1] - ylim[0]) * 0.1, ylim[1] - (ylim[1] - ylim[0]) * 0.1])
-    canvas.draw()
-
-def zoomOut():
-    ax = canvas.figure.gca()
-    xlim = ax.get_xlim()
-    ylim = ax.get_ylim()
-    ax.set_xlim([xlim[0] - (xlim[1] - xlim[0]) * 0.1, xlim[1] + (xlim[1] - xlim[0]) * 0.1])
-    ax.set_ylim([ylim[0] - (ylim[1] - ylim[0]) * 0.1, ylim[1] + (ylim[1] - ylim[0]) * 0.1])
-    canvas.draw()
-
-
-
-
-
-
-def bufferDialog():
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Buffer Tool")
-    layout = QFormLayout(dialog)
-
-    # Input vector file
-    inputLabel = QLabel("Input Vector File:")
-    inputLineEdit = QLineEdit()
-    inputBrowseButton = QPushButton("Browse")
-    inputBrowseButton.clicked.connect(lambda: browseFile(inputLineEdit, 'Vector Files (*.shp)'))
-
-    # Output file
-    outputLabel = QLabel("Output File:")
-    outputLineEdit = QLineEdit()
-    outputBrowseButton = QPushButton("Browse")
-    outputBrowseButton.clicked.connect(lambda: browseFile(outputLineEdit, 'Vector Files (*.shp)', save=True))
-
-    # Buffer distance
-    distanceLabel = QLabel("Buffer Distance:")
-    distanceLineEdit = QLineEdit()
-
-    # Add components to the dialog layout
-    calculateButton = QPushButton("Calculate Buffer")
-    calculateButton.clicked.connect(
-        lambda: calculateBuffer(inputLineEdit.text(), outputLineEdit.text(), distanceLineEdit.text())
-    )
-
-    layout.addRow(inputLabel, inputLineEdit)
-    layout.addRow("", inputBrowseButton)
-    layout.addRow(outputLabel, outputLineEdit)
-    layout.addRow("", outputBrowseButton)
-    layout.addRow(distanceLabel, distanceLineEdit)
-    layout.addRow("", calculateButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def calculateBuffer(inputPath, outputPath, distance):
-    try:
-        distance = float(distance)
-        gdf = gpd.read_file(inputPath)
-        gdf['geometry'] = gdf.buffer(distance)
-        gdf.to_file(outputPath)
-        QMessageBox.information(window, "Success", "Buffer created successfully!")
-        loadVector(outputPath)
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"Buffer operation failed: {e}")
-
-
-def clipDialog():
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Clip Tool")
-    layout = QFormLayout(dialog)
-
-    # Input files
-    inputLabel = QLabel("Input Vector File:")
-    inputLineEdit = QLineEdit()
-    inputBrowseButton = QPushButton("Browse")
-    inputBrowseButton.clicked.connect(lambda: browseFile(inputLineEdit, 'Vector Files (*.shp)'))
-
-    clipLabel = QLabel("Clip Layer File:")
-    clipLineEdit = QLineEdit()
-    clipBrowseButton = QPushButton("Browse")
-    clipBrowseButton.clicked.connect(lambda: browseFile(clipLineEdit, 'Vector Files (*.shp)'))
-
-    # Output file
-    outputLabel = QLabel("Output File:")
-    outputLineEdit = QLineEdit()
-    outputBrowseButton = QPushButton("Browse")
-    outputBrowseButton.clicked.connect(lambda: browseFile(outputLineEdit, 'Vector Files (*.shp)', save=True))
-
-    calculateButton = QPushButton("Clip Layers")
-    calculateButton.clicked.connect(
-        lambda: calculateClip(inputLineEdit.text(), clipLineEdit.text(), outputLineEdit.text())
-    )
-
-    layout.addRow(inputLabel, inputLineEdit)
-    layout.addRow("", inputBrowseButton)
-    layout.addRow(clipLabel, clipLineEdit)
-    layout.addRow("", clipBrowseButton)
-    layout.addRow(outputLabel, outputLineEdit)
-    layout.addRow("", outputBrowseButton)
-    layout.addRow("", calculateButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def calculateClip(inputPath, clipPath, outputPath):
-    try:
-        input_gdf = gpd.read_file(inputPath)
-        clip_gdf = gpd.read_file(clipPath)
-        clipped_gdf = gpd.clip(input_gdf, clip_gdf)
-        clipped_gdf.to_file(outputPath)
-        QMessageBox.information(window, "Success", "Clip operation completed!")
-        loadVector(outputPath)
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"Clip operation failed: {e}")
-
-
-def intersectDialog():
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Intersect Tool")
-    layout = QFormLayout(dialog)
-
-    # Input files
-    inputLabel1 = QLabel("Input Layer 1:")
-    inputLineEdit1 = QLineEdit()
-    inputBrowseButton1 = QPushButton("Browse")
-    inputBrowseButton1.clicked.connect(lambda: browseFile(inputLineEdit1, 'Vector Files (*.shp)'))
-
-    inputLabel2 = QLabel("Input Layer 2:")
-    inputLineEdit2 = QLineEdit()
-    inputBrowseButton2 = QPushButton("Browse")
-    inputBrowseButton2.clicked.connect(lambda: browseFile(inputLineEdit2, 'Vector Files (*.shp)'))
-
-    # Output file
-    outputLabel = QLabel("Output File:")
-    outputLineEdit = QLineEdit()
-    outputBrowseButton = QPushButton("Browse")
-    outputBrowseButton.clicked.connect(lambda: browseFile(outputLineEdit, 'Vector Files (*.shp)', save=True))
-
-    calculateButton = QPushButton("Calculate Intersection")
-    calculateButton.clicked.connect(
-        lambda: calculateIntersect(inputLineEdit1.text(), inputLineEdit2.text(), outputLineEdit.text())
-    )
-
-    layout.addRow(inputLabel1, inputLineEdit1)
-    layout.addRow("", inputBrowseButton1)
-    layout.addRow(inputLabel2, inputLineEdit2)
-    layout.addRow("", inputBrowseButton2)
-    layout.addRow(outputLabel, outputLineEdit)
-    layout.addRow("", outputBrowseButton)
-    layout.addRow("", calculateButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def calculateIntersect(inputPath1, inputPath2, outputPath):
-    try:
-        gdf1 = gpd.read_file(inputPath1)
-        gdf2 = gpd.read_file(inputPath2)
-        intersected_gdf = gpd.overlay(gdf1, gdf2, how="intersection")
-        intersected_gdf.to_file(outputPath)
-        QMessageBox.information(window, "Success", "Intersection operation completed!")
-        loadVector(outputPath)
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"Intersection operation failed: {e}")
-
-
-def ndviDialog():
-    performRasterCalculation("NDVI", calculateNDVI)
-
-
-def ndbiDialog():
-    performRasterCalculation("NDBI", calculateNDBI)
-
-
-def lstDialog():
-    performRasterCalculation("LST", calculateLST)
-
-
-def performRasterCalculation(toolName, calculationFunc):
-    dialog = QDialog(window)
-    dialog.setWindowTitle(f"{toolName} Tool")
-    layout = QFormLayout(dialog)
-
-    # Input raster file
-    rasterLabel = QLabel("Input Raster File:")
-    rasterLineEdit = QLineEdit()
-    rasterBrowseButton = QPushButton("Browse")
-    rasterBrowseButton.clicked.connect(lambda: browseFile(rasterLineEdit, 'Raster Files (*.tif *.tiff *.img)'))
-
-    # Band inputs
-    bandLabel1 = QLabel("Band 1:")
-    bandLineEdit1 = QLineEdit()
-
-    bandLabel2 = QLabel("Band 2:")
-    bandLineEdit2 = QLineEdit()
-
-    # Output file
-    outputLabel = QLabel("Output File:")
-    outputLineEdit = QLineEdit()
-    outputBrowseButton = QPushButton("Browse")
-    outputBrowseButton.clicked.connect(lambda: browseFile(outputLineEdit, 'Raster Files (*.tif *.tiff)', save=True))
-
-    calculateButton = QPushButton(f"Calculate {toolName}")
-    calculateButton.clicked.connect(
-        lambda: calculationFunc(rasterLineEdit.text(), bandLineEdit1.text(), bandLineEdit2.text(), outputLineEdit.text())
-    )
-
-    layout.addRow(rasterLabel, rasterLineEdit)
-    layout.addRow("", rasterBrowseButton)
-    layout.addRow(bandLabel1, bandLineEdit1)
-    layout.addRow(bandLabel2, bandLineEdit2)
-    layout.addRow(outputLabel, outputLineEdit)
-    layout.addRow("", outputBrowseButton)
-    layout.addRow("", calculateButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def calculateNDVI(rasterFile, redBand, nirBand, outputFile):
-    calculateRasterIndex(rasterFile, redBand, nirBand, outputFile, lambda nir, red: (nir - red) / (nir + red))
-
-
-def calculateNDBI(rasterFile, swirBand, nirBand, outputFile):
-    calculateRasterIndex(rasterFile, swirBand, nirBand, outputFile, lambda swir, nir: (swir - nir) / (swir + nir))
-
-
-def calculateLST(rasterFile, thermalBand, _, outputFile):
-    calculateRasterIndex(rasterFile, thermalBand, None, outputFile, lambda t, _: (t * 0.00341802 + 149)-273.15)
-
-
-def rasterOverlayDialog():
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Raster Overlay Tool")
-    layout = QFormLayout(dialog)
-
-    # Input raster files
-    lstLabel = QLabel("Land Surface Temperature (LST) File:")
-    lstLineEdit = QLineEdit()
-    lstBrowseButton = QPushButton("Browse")
-    lstBrowseButton.clicked.connect(lambda: browseFile(lstLineEdit, 'Raster Files (*.tif *.tiff *.img)'))
-
-    ndviLabel = QLabel("Normalized Difference Vegetation Index (NDVI) File:")
-    ndviLineEdit = QLineEdit()
-    ndviBrowseButton = QPushButton("Browse")
-    ndviBrowseButton.clicked.connect(lambda: browseFile(ndviLineEdit, 'Raster Files (*.tif *.tiff *.img)'))
-
-    ndbiLabel = QLabel("Normalized Difference Built-up Index (NDBI) File:")
-    ndbiLineEdit = QLineEdit()
-    ndbiBrowseButton = QPushButton("Browse")
-    ndbiBrowseButton.clicked.connect(lambda: browseFile(ndbiLineEdit, 'Raster Files (*.tif *.tiff *.img)'))
-
-    # Output file
-    outputLabel = QLabel("Output File:")
-    outputLineEdit = QLineEdit()
-    outputBrowseButton = QPushButton("Browse")
-    outputBrowseButton.clicked.connect(lambda: browseFile(outputLineEdit, 'Raster Files (*.tif *.tiff)', save=True))
-
-    calculateButton = QPushButton("Calculate Overlay")
-    calculateButton.clicked.connect(
-        lambda: calculateOverlay(lstLineEdit.text(), ndviLineEdit.text(), ndbiLineEdit.text(), outputLineEdit.text())
-    )
-
-    layout.addRow(lstLabel, lstLineEdit)
-    layout.addRow("", lstBrowseButton)
-    layout.addRow(ndviLabel, ndviLineEdit)
-    layout.addRow("", ndviBrowseButton)
-    layout.addRow(ndbiLabel, ndbiLineEdit)
-    layout.addRow("", ndbiBrowseButton)
-    layout.addRow(outputLabel, outputLineEdit)
-    layout.addRow("", outputBrowseButton)
-    layout.addRow("", calculateButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def calculateOverlay(lstFile, ndviFile, ndbiFile, outputFile):
-    try:
-        with rasterio.open(lstFile) as lst_src, rasterio.open(ndviFile) as ndvi_src, rasterio.open(ndbiFile) as ndbi_src:
-            lst_data = lst_src.read(1).astype(np.float32)
-            ndvi_data = ndvi_src.read(1).astype(np.float32)
-            ndbi_data = ndbi_src.read(1).astype(np.float32)
-            
-            # Example UHI calculation (this is a placeholder, replace with actual calculation)
-            uhi_data = lst_data - (ndvi_data + ndbi_data) / 2
-            
-            profile = lst_src.profile
-            profile.update(dtype=rasterio.float32)
-            
-            with rasterio.open(outputFile, 'w', **profile) as dst:
-                dst.write(uhi_data, 1)
-        
-        QMessageBox.information(window, "Success", f"UHI calculation completed: {outputFile}")
-        loadRaster(outputFile)
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"UHI calculation failed: {e}")
-
-def calculateRasterIndex(rasterFile, band1, band2, outputFile, calculation):
-    try:
-        band1, band2 = int(band1), int(band2) if band2 else None
-        with rasterio.open(rasterFile) as src:
-            data1 = src.read(band1).astype(np.float32)
-            data2 = src.read(band2).astype(np.float32) if band2 else None
-            result = calculation(data1, data2)
-            profile = src.profile
-            profile.update(dtype=rasterio.float32)
-
-            with rasterio.open(outputFile, 'w', **profile) as dst:
-                dst.write(result, 1)
-
-        QMessageBox.information(window, "Success", f"Calculation completed: {outputFile}")
-        loadRaster(outputFile)
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"Calculation failed: {e}")
-
-
-def browseFile(lineEdit, fileFilter, save=False):
-    dialogFunc = QFileDialog.getSaveFileName if save else QFileDialog.getOpenFileName
-    filePath, _ = dialogFunc(window, "Select File", "", fileFilter)
-    if filePath:
-        lineEdit.setText(filePath)
-
-
-def connectToDatabase():
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Connect to Database")
-
-    layout = QFormLayout(dialog)
-
-    # Database connection fields
-    hostLabel = QLabel("Host:")
-    hostLineEdit = QLineEdit()
-    layout.addRow(hostLabel, hostLineEdit)
-
-    portLabel = QLabel("Port:")
-    portLineEdit = QLineEdit()
-    layout.addRow(portLabel, portLineEdit)
-
-    dbLabel = QLabel("Database:")
-    dbLineEdit = QLineEdit()
-    layout.addRow(dbLabel, dbLineEdit)
-
-    userLabel = QLabel("User:")
-    userLineEdit = QLineEdit()
-    layout.addRow(userLabel, userLineEdit)
-
-    passLabel = QLabel("Password:")
-    passLineEdit = QLineEdit()
-    passLineEdit.setEchoMode(QLineEdit.Password)
-    layout.addRow(passLabel, passLineEdit)
-
-    # Connect button
-    connectButton = QPushButton("Connect")
-    connectButton.clicked.connect(lambda: connectDatabase(
-        hostLineEdit.text(),
-        portLineEdit.text(),
-        dbLineEdit.text(),
-        userLineEdit.text(),
-        passLineEdit.text()
-    ))
-    layout.addRow("", connectButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def connectDatabase(host, port, database, user, password):
-    try:
-        global dbConnection
-        dbConnection = psycopg2.connect(
-            host=host,
-            port=port,
-            database=database,
-            user=user,
-            password=password
-        )
-        QMessageBox.information(window, "Success", "Connected to the database successfully!")
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"Failed to connect to the database:\n{e}")
-
-
-def importFromDatabase():
-    if not 'dbConnection' in globals() or dbConnection.closed:
-        QMessageBox.warning(window, "Database Error", "Please connect to a database first!")
-        return
-
-    dialog = QDialog(window)
-    dialog.setWindowTitle("Import from Database")
-
-    layout = QFormLayout(dialog)
-
-    # Table selection
-    tableLabel = QLabel("Table Name:")
-    tableLineEdit = QLineEdit()
-    layout.addRow(tableLabel, tableLineEdit)
-
-    # Import button
-    importButton = QPushButton("Import")
-    importButton.clicked.connect(lambda: loadDataFromDatabase(tableLineEdit.text()))
-    layout.addRow("", importButton)
-
-    dialog.setLayout(layout)
-    dialog.exec_()
-
-
-def loadDataFromDatabase(tableName):
-    if not tableName:
-        QMessageBox.warning(window, "Input Error", "Table name cannot be empty!")
-        return
-
-    try:
-        query = f"SELECT * FROM {tableName}"
-        gdf = gpd.read_postgis(query, dbConnection, geom_col="geom")
-        layers[tableName] = {"type": "vector", "data": gdf}
-        updateTOC()
-        QMessageBox.information(window, "Success", f"Data imported from table: {tableName}")
-    except Exception as e:
-        QMessageBox.critical(window, "Error", f"Failed to import data:\n{e}")
-
-
-
-def showHelp():
-    QMessageBox.information(window, "Help", "This is a simple GIS application. Use the File menu to open, save, or connect to a database. The Geoprocessing menu contains tools for buffer, clip, and intersect operations. The Toolbox menu contains tools for NDVI, NDBI,LST, Raster Overlay calculations.")
-
-
-
-# Initialize and run the application
-initUI()
-sys.exit(app.exec_())
+import os
+import sys
+import rasterio
+from rasterio.enums import Resampling
+from rasterio.windows import Window
+import shapely
+import psycopg2
+from psycopg2 import sql
+import geopandas as gpd
+import pandas as pd
+import numpy as np
+
+try:
+    # pyogrio does vectorized batch I/O in C, typically 5-20x faster than
+    # the default fiona per-feature loop for shapefile reads/writes.
+    import pyogrio  # noqa: F401
+    gpd.options.io_engine = "pyogrio"
+except ImportError:
+    pass
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+if numba is not None:
+    # Single-pass fused kernels: SIMD-vectorized and multithreaded by LLVM,
+    # no temporaries. Called on flattened float32 views. The eps term keeps
+    # the division branchless where nir + red == 0.
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _ndi(a, b, out):
+        eps = np.float32(1e-12)
+        for i in numba.prange(a.size):
+            out[i] = (a[i] - b[i]) / (a[i] + b[i] + eps)
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _uhi(lst, ndvi, ndbi, out):
+        half = np.float32(0.5)
+        for i in numba.prange(lst.size):
+            out[i] = lst[i] - (ndvi[i] + ndbi[i]) * half
+from matplotlib.colors import Normalize
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, NavigationToolbar2QT
+from matplotlib.figure import Figure
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QMenu, QAction, QMessageBox, QDockWidget, QVBoxLayout,
+    QWidget, QCheckBox, QListWidget, QListWidgetItem, QFileDialog, QDialog, QLabel, 
+    QLineEdit, QPushButton, QFormLayout, QComboBox, QHBoxLayout
+)
+from PyQt5.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QBrush, QLinearGradient
+
+
+# Global variables
+app = QApplication(sys.argv)
+window = QMainWindow()
+layers = {}
+canvas = None
+tocListWidget = None
+backgroundCache = None
+vectorArtists = []
+redrawTimer = None
+
+
+class GeoTaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class GeoTask(QRunnable):
+    # Runs a geoprocessing callable on the global thread pool so GEOS and
+    # rasterio calls never block the Qt event loop; results and errors come
+    # back to the main thread via queued signals.
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+        self.signals = GeoTaskSignals()
+
+    def run(self):
+        try:
+            result = self.func()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+activeTaskCount = 0
+
+
+def beginBackgroundTask():
+    global activeTaskCount
+    activeTaskCount += 1
+    if activeTaskCount == 1:
+        app.setOverrideCursor(Qt.WaitCursor)
+
+
+def endBackgroundTask():
+    global activeTaskCount
+    activeTaskCount -= 1
+    if activeTaskCount == 0:
+        app.restoreOverrideCursor()
+
+
+def runInBackground(func, onFinished, errorText):
+    task = GeoTask(func)
+
+    def finished(result):
+        endBackgroundTask()
+        # The completion slot touches the UI and layer table; route its
+        # failures (e.g. an unreadable output file) through the same error
+        # dialog instead of letting the exception abort the Qt app.
+        try:
+            onFinished(result)
+        except Exception as e:
+            QMessageBox.critical(window, "Error", f"{errorText}: {e}")
+
+    def failed(message):
+        endBackgroundTask()
+        QMessageBox.critical(window, "Error", f"{errorText}: {message}")
+
+    task.signals.finished.connect(finished)
+    task.signals.failed.connect(failed)
+    beginBackgroundTask()
+    QThreadPool.globalInstance().start(task)
+
+
+def scheduleRedraw():
+    # Coalesce bursts of zoom/scroll events into at most one redraw per
+    # frame; touchpads can emit 60+ wheel ticks a second and a synchronous
+    # draw per tick saturates the renderer.
+    redrawTimer.start()
+
+
+def initUI():
+    global canvas, tocListWidget, tocDockWidget, redrawTimer
+
+    # Debounce timer for interactive redraws (~one 60 Hz frame)
+    redrawTimer = QTimer(window)
+    redrawTimer.setSingleShot(True)
+    redrawTimer.setInterval(16)
+    redrawTimer.timeout.connect(lambda: canvas.draw_idle())
+
+    # Main window setup
+    window.setWindowTitle('GeoSpyTia')
+    window.setGeometry(100, 100, 800, 600)
+
+    # Menu Bar
+    menubar = window.menuBar()
+
+    # File Menu
+    fileMenu = menubar.addMenu('File')
+    fileMenu.addAction(create_action('New', newFile))
+    fileMenu.addAction(create_action('Open', openFile))
+    fileMenu.addAction(create_action('Save', saveFile))
+    fileMenu.addAction(create_action('Connect To Database', connectToDatabase))
+    fileMenu.addAction(create_action('Exit', window.close))
+
+    # Geoprocessing Menu
+    geoprocessingMenu = menubar.addMenu('Geoprocessing')
+    geoprocessingMenu.addAction(create_action('Buffer', bufferDialog))
+    geoprocessingMenu.addAction(create_action('Clip', clipDialog))
+    geoprocessingMenu.addAction(create_action('Intersect', intersectDialog))
+
+    # Toolbox Menu
+    toolboxMenu = menubar.addMenu('Toolbox')
+    toolboxMenu.addAction(create_action('NDVI', ndviDialog))
+    toolboxMenu.addAction(create_action('NDBI', ndbiDialog))
+    toolboxMenu.addAction(create_action('LST', lstDialog))
+    toolboxMenu.addAction(create_action('Raster Overlay', rasterOverlayDialog))
+    
+
+
+
+    # Help Menu
+    helpMenu = menubar.addMenu('Help')
+    helpMenu.addAction(create_action('Read', showHelp))
+
+    # Toolbar
+    toolbar = window.addToolBar('Toolbar')
+    toolbar.addAction(create_action_with_icon('New', 'icons/newfile.png', newFile))
+    toolbar.addAction(create_action_with_icon('Open', 'icons/openfolder.png', openFile))
+    toolbar.addAction(create_action_with_icon('Save', 'icons/save.png', saveFile))
+    toolbar.addAction(create_action_with_icon('Zoom In', 'icons/zoomin.png', zoomIn))
+    toolbar.addAction(create_action_with_icon('Zoom Out', 'icons/zoomout.png', zoomOut))
+    
+    
+    # Create the "Add Data" dropdown menu
+    addDataMenu = QMenu(window)
+    addDataMenu.addAction(create_action('Load Data', openFile))
+    addDataMenu.addAction(create_action('From Database', importFromDatabase))
+
+    # Create the "Add Data" toolbar action with the dropdown menu
+    addDataAction = QAction(QIcon('icons/adddata.png'), '', window)
+    addDataAction.setMenu(addDataMenu)
+
+    # Add the action to the toolbar
+    toolbar.addAction(addDataAction)
+
+    toolbar.addAction(create_action_with_icon('TOC', 'icons/toc.png', toggleTOC))
+    toolbar.addAction(create_action_with_icon('Pan', 'icons/navigation.png', navPan))
+
+
+    # TOC (Table of Contents)
+    tocDockWidget = QDockWidget("Table of Contents", window)
+    tocListWidget = QListWidget()
+    tocDockWidget.setWidget(tocListWidget)
+    window.addDockWidget(Qt.LeftDockWidgetArea, tocDockWidget)
+    tocListWidget.setContextMenuPolicy(Qt.CustomContextMenu)
+    tocListWidget.customContextMenuRequested.connect(showContextMenu)
+
+    # Canvas for map display
+    canvas = FigureCanvas(Figure())
+    canvas.mpl_connect('resize_event', invalidateBackground)
+    canvas.mpl_connect('draw_event', captureBackground)
+    ax = canvas.figure.gca()
+    ax.callbacks.connect('xlim_changed', onViewLimitsChanged)
+    ax.callbacks.connect('ylim_changed', onViewLimitsChanged)
+    centralWidget = QWidget()
+    layout = QVBoxLayout()
+    layout.addWidget(canvas)
+    centralWidget.setLayout(layout)
+    window.setCentralWidget(centralWidget)
+
+    # Show window
+    window.show()
+
+def toggleTOC():
+    if tocDockWidget.isHidden():
+        tocDockWidget.show()
+    
+
+def addData():
+    dialog = QDialog(window)
+    dialog.setWindowTitle("Add Data")
+
+    layout = QFormLayout(dialog)
+
+    # Data source selection
+    sourceLabel = QLabel("Data Source:")
+    sourceComboBox = QComboBox()
+    sourceComboBox.addItems(["Raster", "Vector"])
+    layout.addRow(sourceLabel, sourceComboBox)
+
+    # File selection
+    fileLabel = QLabel("File:")
+    fileLineEdit = QLineEdit()
+    fileBrowseButton = QPushButton("Browse")
+    fileBrowseButton.clicked.connect(lambda: browseFile(fileLineEdit, 'All Files (*)'))
+    layout.addRow(fileLabel, fileLineEdit)
+    layout.addRow("", fileBrowseButton)
+
+    # Import button
+    importButton = QPushButton("Import")
+    importButton.clicked.connect(lambda: importData(sourceComboBox.currentText(), fileLineEdit.text()))
+    
+    layout.addRow("", importButton)
+
+    dialog.setLayout(layout)
+    dialog.exec_()
+
+
+def importData(dataType, filePath):
+    if dataType == "Raster":
+        loadRaster(filePath)
+    elif dataType == "Vector":
+        loadVector(filePath)
+    else:
+        QMessageBox.warning(window, 'Unsupported Data Type', 'Unsupported data type selected!')
+
+
+def create_action(name, func):
+    action = QAction(name, window)
+    action.triggered.connect(func)
+    return action
+
+
+def create_action_with_icon(name, icon_path, func):
+    action = QAction(QIcon(icon_path), name, window)
+    action.triggered.connect(func)
+    return action
+
+
+def newFile():
+    global layers
+    reply = QMessageBox.question(window, 'New File', 'Are you sure you want to create a new file? Unsaved changes will be lost.', QMessageBox.Yes | QMessageBox.No)
+    if reply == QMessageBox.No:
+        return
+    tocListWidget.clear()
+    for layer_data in layers.values():
+        releaseLayer(layer_data)
+    layers.clear()
+    updateDisplay()
+    QMessageBox.information(window, 'New File', 'New file created!')
+
+
+def openFile():
+    filePath, _ = QFileDialog.getOpenFileName(window, 'Open File', '', 
+                                              'Raster Files (*.tif *.tiff *.img);;Vector Files (*.shp *.parquet);;All Files (*)')
+    if filePath:
+        if filePath.endswith(('.tif', '.tiff', '.img')):
+            loadRaster(filePath)
+        elif filePath.endswith(('.shp', '.parquet')):
+            loadVector(filePath)
+        else:
+            QMessageBox.warning(window, 'Unsupported Format', 'Unsupported file format!')
+
+
+def saveFile():
+    filePath, _ = QFileDialog.getSaveFileName(window, 'Save File', '', 
+                                              'Raster Files (*.tif *.tiff *.img);;Vector Files (*.shp *.parquet);;All Files (*)')
+    if filePath:
+        try:
+            for layer_data in layers.values():
+                if layer_data['type'] == 'raster':
+                    saveRasterLayer(filePath, layer_data)
+                elif layer_data['type'] == 'vector':
+                    writeVector(layer_data['data'], filePath)
+            QMessageBox.information(window, 'Save File', 'File saved successfully!')
+        except Exception as e:
+            QMessageBox.critical(window, 'Save File', f'Failed to save file: {e}')
+
+
+def saveRasterLayer(filePath, layer):
+    # Write a real tiled GeoTIFF with parallel zstd compression rather
+    # than dumping a raw .npy array. Georeferencing comes from the source
+    # dataset when the layer is file-backed.
+    arr = rasterArray(layer)
+    profile = {
+        'driver': 'GTiff',
+        'dtype': arr.dtype,
+        'count': 1,
+        'height': arr.shape[0],
+        'width': arr.shape[1],
+        'tiled': True,
+        'blockxsize': 512,
+        'blockysize': 512,
+        'compress': 'zstd',
+        'predictor': 3 if np.issubdtype(arr.dtype, np.floating) else 2,
+        'num_threads': 'all_cpus',
+    }
+    src = layer.get('src')
+    if src is not None:
+        profile['transform'] = src.transform
+        profile['crs'] = src.crs
+    elif layer.get('profile') is not None:
+        profile['transform'] = layer['profile'].get('transform')
+        profile['crs'] = layer['profile'].get('crs')
+    with rasterio.open(filePath, 'w', **profile) as dst:
+        dst.write(arr, 1)
+
+
+def loadRaster(filePath):
+    global layers
+    # Keep the dataset open and read decimated windows on demand instead
+    # of materializing the full band in RAM; GDAL's block cache and any
+    # internal overviews do the heavy lifting.
+    src = rasterio.open(filePath)
+    layers[os.path.basename(filePath)] = {'type': 'raster', 'src': src}
+    updateTOC()
+
+
+def loadRasterArray(name, arr, profile):
+    global layers
+    # Insert a freshly computed array straight into the layer table; the
+    # bytes were just written, so reopening and re-reading the file would
+    # be a pure round-trip.
+    layers[name] = {'type': 'raster', 'data': arr, 'profile': profile}
+    updateTOC()
+
+
+def loadVector(filePath):
+    global layers
+    if filePath.endswith('.parquet'):
+        # Arrow-backed read: no per-feature OGR loop.
+        gdf = gpd.read_parquet(filePath)
+    else:
+        gdf = gpd.read_file(filePath)
+    layers[os.path.basename(filePath)] = {'type': 'vector', 'data': gdf}
+    updateTOC()
+
+
+def writeVector(gdf, outputPath):
+    # GeoParquet serializes through Arrow in one shot and reloads
+    # zero-copy; other formats go through the pyogrio engine configured at
+    # startup.
+    if outputPath.endswith('.parquet'):
+        gdf.to_parquet(outputPath)
+    else:
+        gdf.to_file(outputPath)
+
+
+
+
+_rasterLegendPixmap = None
+
+
+def rasterLegendPixmap():
+    # The raster legend gradient never changes; paint it once and hand the
+    # same pixmap to every TOC row instead of a QPainter cycle per item.
+    global _rasterLegendPixmap
+    if _rasterLegendPixmap is None:
+        pixmap = QPixmap(100, 20)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        gradient = QLinearGradient(0, 0, pixmap.width(), 0)
+        gradient.setColorAt(0.0, Qt.red)
+        gradient.setColorAt(0.33, Qt.yellow)
+        gradient.setColorAt(0.66, Qt.green)
+        gradient.setColorAt(1.0, Qt.blue)
+        painter.fillRect(pixmap.rect(), QBrush(gradient))
+        painter.end()
+        _rasterLegendPixmap = pixmap
+    return _rasterLegendPixmap
+
+
+def updateTOC():
+    # Batch the rebuild: suppress per-item relayout/repaints and checkbox
+    # signals until the whole list is repopulated, then repaint once.
+    tocListWidget.setUpdatesEnabled(False)
+    tocListWidget.blockSignals(True)
+    try:
+        populateTOC()
+    finally:
+        tocListWidget.blockSignals(False)
+        tocListWidget.setUpdatesEnabled(True)
+    tocListWidget.update()
+    updateDisplay()
+
+
+def populateTOC():
+    tocListWidget.clear()
+    for layer_name, layer_data in layers.items():
+        # Create a list widget item
+        item = QListWidgetItem()
+
+        # Create a custom widget to hold the checkbox, legend, and layer name
+        widget = QWidget()
+        layout = QHBoxLayout()
+
+        # Create a checkbox to toggle layer visibility
+        checkbox = QCheckBox(layer_name)
+        checkbox.setChecked(True)
+        checkbox.stateChanged.connect(lambda state, name=layer_name: toggleLayer(state, name))
+        layout.addWidget(checkbox)
+
+        # Add a color legend
+        colorLabel = QLabel()
+        colorLabel.setFixedSize(100, 20)  # Adjust size for better visibility
+
+        if layer_data['type'] == 'raster':
+            colorLabel.setPixmap(rasterLegendPixmap())
+
+        elif layer_data['type'] == 'vector':
+            # Use a solid color for vector legend
+            colorLabel.setStyleSheet("background-color: blue;")
+
+        layout.addWidget(colorLabel)
+
+        # Ensure alignment and spacing are neat
+        layout.setAlignment(Qt.AlignLeft)
+        layout.setContentsMargins(5, 2, 5, 2)
+        layout.setSpacing(5)
+
+        widget.setLayout(layout)
+
+        # Add the widget to the TOC list
+        tocListWidget.addItem(item)
+        tocListWidget.setItemWidget(item, widget)
+
+
+
+def showContextMenu(pos):
+    contextMenu = QMenu(window)
+    removeLayerAct = QAction('Remove Layer', window)
+    removeLayerAct.triggered.connect(removeLayer)
+    contextMenu.addAction(removeLayerAct)
+    contextMenu.exec_(tocListWidget.mapToGlobal(pos))
+
+def removeLayer():
+    currentRow = tocListWidget.currentRow()
+    if currentRow >= 0:
+        item = tocListWidget.item(currentRow)
+        # The layer name lives on the checkbox inside the row widget; the
+        # item itself carries no text. Resolve it before takeItem drops
+        # the widget association.
+        checkbox = tocListWidget.itemWidget(item).findChild(QCheckBox)
+        layerName = checkbox.text()
+        tocListWidget.takeItem(currentRow)
+        if layerName in layers:
+            releaseLayer(layers[layerName])
+            del layers[layerName]
+
+        # Clear the map display
+        updateDisplay()
+        QMessageBox.information(window, 'Remove Layer', 'Layer removed successfully!')
+
+
+def toggleLayer(state, layerName):
+    # Artists are cached on the layers, so a checkbox flip only needs new
+    # visibility flags. When the raster background is unchanged, restore
+    # the cached bitmap and blit the vector artists instead of paying for
+    # a full draw.
+    rasterBefore = visibleRasterArtist()
+    syncLayerVisibility()
+    if backgroundCache is not None and visibleRasterArtist() is rasterBefore:
+        blitForeground()
+    else:
+        updateDisplay()
+
+
+def visibleRasterArtist():
+    for layer_data in layers.values():
+        if layer_data['type'] == 'raster':
+            for artist in layer_data.get('artists') or []:
+                if artist.get_visible():
+                    return artist
+    return None
+
+
+def invalidateBackground(*args):
+    global backgroundCache
+    backgroundCache = None
+
+
+def captureBackground(event):
+    # Runs after every full draw: cache the scene (vector artists are
+    # animated, so the draw skipped them) and render them into the Agg
+    # buffer that is about to be painted. No canvas.blit here — the Qt
+    # backend's blit is a synchronous repaint and calling it from inside
+    # the draw event re-enters Qt painting.
+    global backgroundCache
+    ax = canvas.figure.gca()
+    backgroundCache = canvas.copy_from_bbox(ax.bbox)
+    for artist in vectorArtists:
+        ax.draw_artist(artist)
+
+
+def blitForeground():
+    # Fast path: restore the cached background bitmap and redraw only the
+    # vector artists on top, skipping a full re-rasterization of the scene.
+    if backgroundCache is None:
+        updateDisplay()
+        return
+    ax = canvas.figure.gca()
+    canvas.restore_region(backgroundCache)
+    for artist in vectorArtists:
+        ax.draw_artist(artist)
+    canvas.blit(ax.bbox)
+
+
+def decimateForDisplay(data):
+    # Stride the raster down to roughly screen resolution before handing it
+    # to imshow; Matplotlib otherwise resamples the full array on every
+    # redraw. The extent passed alongside keeps world coordinates intact.
+    maxDisplayPixels = max(1, canvas.get_width_height()[0])
+    stride = max(1, min(data.shape) // maxDisplayPixels)
+    return data[::stride, ::stride]
+
+
+def rasterDisplayData(layer):
+    # Produce a screen-resolution array for display. Layers backed by an
+    # open dataset are decimated by GDAL itself (reusing overviews when
+    # present); in-memory arrays fall back to strided views.
+    src = layer.get('src')
+    if src is not None:
+        maxDisplayPixels = max(1, canvas.get_width_height()[0])
+        stride = max(1, min(src.height, src.width) // maxDisplayPixels)
+        data = src.read(1,
+                        out_shape=(max(1, src.height // stride),
+                                   max(1, src.width // stride)),
+                        resampling=Resampling.average)
+        return data, src.height, src.width
+    data = layer['data']
+    return decimateForDisplay(data), data.shape[0], data.shape[1]
+
+
+_refreshingRasterView = False
+
+
+def refreshRasterArtist(ax, layer, artist):
+    # Re-read the visible portion of the raster at the current zoom's
+    # resolution so detail lost to decimation comes back when zooming in.
+    src = layer.get('src')
+    if src is not None:
+        height, width = src.height, src.width
+    else:
+        height, width = layer['data'].shape
+    xmin, xmax = sorted(ax.get_xlim())
+    ymin, ymax = sorted(ax.get_ylim())
+    col0 = int(np.clip(np.floor(xmin + 0.5), 0, width))
+    col1 = int(np.clip(np.ceil(xmax + 0.5), 0, width))
+    row0 = int(np.clip(np.floor(ymin + 0.5), 0, height))
+    row1 = int(np.clip(np.ceil(ymax + 0.5), 0, height))
+    if col1 <= col0 or row1 <= row0:
+        return
+    maxDisplayPixels = max(1, canvas.get_width_height()[0])
+    stride = max(1, min(row1 - row0, col1 - col0) // maxDisplayPixels)
+    viewKey = (col0, row0, col1, row1, stride)
+    if layer.get('viewKey') == viewKey:
+        return
+    layer['viewKey'] = viewKey
+    if src is not None:
+        data = src.read(1,
+                        window=Window(col0, row0, col1 - col0, row1 - row0),
+                        out_shape=(max(1, (row1 - row0) // stride),
+                                   max(1, (col1 - col0) // stride)),
+                        resampling=Resampling.average)
+    else:
+        data = layer['data'][row0:row1:stride, col0:col1:stride]
+    artist.set_data(data)
+    artist.set_extent((col0 - 0.5, col1 - 0.5, row1 - 0.5, row0 - 0.5))
+
+
+def onViewLimitsChanged(ax):
+    # xlim_changed/ylim_changed callback: refresh the displayed raster at
+    # the new zoom level. Guarded against re-entry because set_extent can
+    # itself nudge the axes limits.
+    global _refreshingRasterView
+    if _refreshingRasterView:
+        return
+    _refreshingRasterView = True
+    try:
+        for layer_data in layers.values():
+            if layer_data['type'] != 'raster':
+                continue
+            for artist in layer_data.get('artists') or []:
+                if artist.get_visible():
+                    refreshRasterArtist(ax, layer_data, artist)
+        invalidateBackground()
+    finally:
+        _refreshingRasterView = False
+
+
+def ensureLayerArtists(ax, layer):
+    # Create each layer's artists once and keep them on the axes;
+    # re-running imshow/plot would re-upload the full array on every
+    # refresh.
+    artists = layer.get('artists')
+    if artists:
+        return artists
+    if layer['type'] == 'raster':
+        data, height, width = rasterDisplayData(layer)
+        if 'norm' not in layer:
+            # Fix the stretch once per layer (2-98 percentile) so later
+            # draws skip the full-array autoscale rescan.
+            vmin, vmax = np.nanpercentile(data, [2, 98])
+            layer['norm'] = Normalize(vmin, vmax)
+        artists = [ax.imshow(data,
+                             cmap='Spectral', norm=layer['norm'],
+                             extent=(-0.5, width - 0.5, height - 0.5, -0.5),
+                             visible=False)]
+    elif layer['type'] == 'vector':
+        # GeoDataFrame.plot adds one collection per geometry type, so a
+        # mixed-type layer needs all of them toggled and removed as a group.
+        before = set(map(id, ax.collections))
+        layer['data'].plot(ax=ax, edgecolor='blue', facecolor='none')
+        artists = [c for c in ax.collections if id(c) not in before]
+        for collection in artists:
+            collection.set_visible(False)
+            # Animated artists are excluded from full draws; the
+            # draw-event hook blits them on top of the cached background.
+            collection.set_animated(True)
+    layer['artists'] = artists
+    return artists
+
+
+def removeLayerArtists(layer):
+    for artist in layer.get('artists') or []:
+        artist.remove()
+    layer['artists'] = None
+
+
+def releaseLayer(layer):
+    removeLayerArtists(layer)
+    src = layer.get('src')
+    if src is not None:
+        src.close()
+        layer['src'] = None
+
+
+def rasterArray(layer):
+    # Full-resolution band for the persistence/compute paths; display uses
+    # the decimated rasterDisplayData instead.
+    if layer.get('src') is not None:
+        return layer['src'].read(1)
+    return layer['data']
+
+
+def syncLayerVisibility():
+    global vectorArtists
+    ax = canvas.figure.gca()
+    vectorArtists = []
+    shown = False
+
+    for item_index in range(tocListWidget.count() - 1, -1, -1):  # Iterate from topmost to bottom
+        item = tocListWidget.item(item_index)
+        widget = tocListWidget.itemWidget(item)
+        checkbox = widget.findChild(QCheckBox)
+        layer_name = checkbox.text()
+        if layer_name not in layers:
+            continue
+        layer = layers[layer_name]
+        artists = ensureLayerArtists(ax, layer)
+        visible = not shown and checkbox.isChecked()
+        for artist in artists:
+            artist.set_visible(visible)
+        if visible:
+            shown = True  # Display only the uppermost checked layer
+            if layer['type'] == 'raster':
+                # Add color bar
+                if not hasattr(canvas, 'cbar'):
+                    canvas.cbar = canvas.figure.colorbar(artists[0], ax=ax, orientation='vertical')
+                else:
+                    canvas.cbar.update_normal(artists[0])
+                canvas.cbar.set_label('Value')
+            elif layer['type'] == 'vector':
+                vectorArtists = list(artists)
+
+
+def updateDisplay():
+    ax = canvas.figure.gca()
+    syncLayerVisibility()
+    ax.set_aspect('equal')
+    ax.axis('off')
+    # The draw-event hook caches the rendered background and blits the
+    # vector artists on top.
+    canvas.draw()
+
+
+
+def navPan():
+    if not hasattr(window, 'nav_toolbar'):
+        window.nav_toolbar = NavigationToolbar2QT(canvas, window)
+        window.addToolBar(window.nav_toolbar)
+    if window.nav_toolbar.isVisible():
+        window.nav_toolbar.hide()
+    else:
+        window.nav_toolbar.show()
+    window.nav_toolbar.pan()
+    canvas.draw_idle()
+
+
+def wheelEvent(event):
+    ax = canvas.figure.gca()
+    xlim = ax.get_xlim()
+    ylim = ax.get_ylim()
+    
+    # Get the mouse position in data coordinates
+    xdata = event.pos().x()
+    ydata = event.pos().y()
+    inv = ax.transData.inverted()
+    xdata, ydata = inv.transform((xdata, ydata))
+    
+    # Calculate zoom factor
+    zoom_factor = 0.1
+    if event.angleDelta().y() > 0:
+        scale_factor = 1 - zoom_factor
+    else:
+        scale_factor = 1 + zoom_factor
+    
+    # Adjust the limits based on the mouse position
+    new_xlim = [xdata - (xdata - xlim[0]) * scale_factor, xdata + (xlim[1] - xdata) * scale_factor]
+    new_ylim = [ydata - (ydata - ylim[0]) * scale_factor, ydata + (ylim[1] - ydata) * scale_factor]
+    
+    ax.set_xlim(new_xlim)
+    ax.set_ylim(new_ylim)
+    # The cached bitmap no longer matches the new view limits; coalesce the
+    # redraw instead of rendering synchronously per scroll tick.
+    invalidateBackground()
+    scheduleRedraw()
+
+window.wheelEvent = wheelEvent
+
+
+
+def zoomIn():
+    ax = canvas.figure.gca()
+    xlim = ax.get_xlim()
+    ylim = ax.get_ylim()
+    ax.set_xlim([xlim[0] + (xlim[1] - xlim[0]) * 0.1, xlim[1] - (xlim[1] - xlim[0]) * 0.1])
+    ax.set_ylim([ylim[0] + (ylim[1] - ylim[0]) * 0.1, ylim[1] - (ylim[1] - ylim[0]) * 0.1])
+    invalidateBackground()
+    scheduleRedraw()
+
+def zoomOut():
+    ax = canvas.figure.gca()
+    xlim = ax.get_xlim()
+    ylim = ax.get_ylim()
+    ax.set_xlim([xlim[0] - (xlim[1] - xlim[0]) * 0.1, xlim[1] + (xlim[1] - xlim[0]) * 0.1])
+    ax.set_ylim([ylim[0] - (ylim[1] - ylim[0]) * 0.1, ylim[1] + (ylim[1] - ylim[0]) * 0.1])
+    invalidateBackground()
+    scheduleRedraw()
+
+
+
+
+
+
+# Cache of constructed tool dialogs; widget construction is the slow part
+# of opening a tool, so each form is built once and the widget tree is
+# reused on later opens.
+dialogCache = {}
+
+
+def showFormDialog(key, title, fields, buttonText, submit):
+    if key not in dialogCache:
+        dialog = QDialog(window)
+        dialog.setWindowTitle(title)
+        layout = QFormLayout(dialog)
+        edits = []
+        for labelText, fileFilter, save in fields:
+            lineEdit = QLineEdit()
+            layout.addRow(QLabel(labelText), lineEdit)
+            if fileFilter is not None:
+                browseButton = QPushButton("Browse")
+                browseButton.clicked.connect(
+                    lambda _, edit=lineEdit, flt=fileFilter, s=save: browseFile(edit, flt, save=s))
+                layout.addRow("", browseButton)
+            edits.append(lineEdit)
+        actionButton = QPushButton(buttonText)
+        actionButton.clicked.connect(lambda: submit(*[edit.text() for edit in edits]))
+        layout.addRow("", actionButton)
+        dialog.setLayout(layout)
+        dialogCache[key] = dialog
+    dialogCache[key].exec_()
+
+
+def bufferDialog():
+    showFormDialog('buffer', "Buffer Tool", [
+        ("Input Vector File:", 'Vector Files (*.shp)', False),
+        ("Output File:", 'Vector Files (*.parquet *.shp)', True),
+        ("Buffer Distance:", None, False),
+    ], "Calculate Buffer", calculateBuffer)
+
+
+def calculateBuffer(inputPath, outputPath, distance):
+    def work():
+        gdf = gpd.read_file(inputPath)
+        # shapely.buffer is a NumPy ufunc over the GeometryArray: one batch
+        # of GIL-free GEOS calls instead of a Python loop per feature.
+        # quad_segs=16 matches GeoSeries.buffer's default resolution so the
+        # output geometry is unchanged.
+        gdf['geometry'] = shapely.buffer(gdf.geometry.to_numpy(), float(distance),
+                                         quad_segs=16)
+        writeVector(gdf, outputPath)
+
+    def done(_):
+        QMessageBox.information(window, "Success", "Buffer created successfully!")
+        loadVector(outputPath)
+
+    runInBackground(work, done, "Buffer operation failed")
+
+
+def clipDialog():
+    showFormDialog('clip', "Clip Tool", [
+        ("Input Vector File:", 'Vector Files (*.shp)', False),
+        ("Clip Layer File:", 'Vector Files (*.shp)', False),
+        ("Output File:", 'Vector Files (*.parquet *.shp)', True),
+    ], "Clip Layers", calculateClip)
+
+
+def calculateClip(inputPath, clipPath, outputPath):
+    def work():
+        input_gdf = gpd.read_file(inputPath)
+        clip_gdf = gpd.read_file(clipPath)
+        # R-tree candidate pruning first, so only features whose bounding
+        # boxes hit the clip layer reach the expensive GEOS intersection:
+        # O(N log M) instead of O(N*M) pairwise tests.
+        candidates = gpd.sjoin(input_gdf, clip_gdf[['geometry']],
+                               predicate='intersects', how='inner')
+        candidates = candidates.drop(columns='index_right')
+        clipped_gdf = candidates[~candidates.index.duplicated(keep='first')].copy()
+        clipped_gdf['geometry'] = clipped_gdf.geometry.intersection(clip_gdf.unary_union)
+        writeVector(clipped_gdf, outputPath)
+
+    def done(_):
+        QMessageBox.information(window, "Success", "Clip operation completed!")
+        loadVector(outputPath)
+
+    runInBackground(work, done, "Clip operation failed")
+
+
+def intersectDialog():
+    showFormDialog('intersect', "Intersect Tool", [
+        ("Input Layer 1:", 'Vector Files (*.shp)', False),
+        ("Input Layer 2:", 'Vector Files (*.shp)', False),
+        ("Output File:", 'Vector Files (*.parquet *.shp)', True),
+    ], "Calculate Intersection", calculateIntersect)
+
+
+def calculateIntersect(inputPath1, inputPath2, outputPath):
+    def work():
+        gdf1 = gpd.read_file(inputPath1)
+        gdf2 = gpd.read_file(inputPath2)
+        # Query the STRtree for candidate pairs, then intersect just those
+        # pairs with one vectorized GEOS call (GIL released) instead of
+        # handing the full layers to gpd.overlay.
+        tree = shapely.STRtree(gdf2.geometry.values)
+        left_idx, right_idx = tree.query(gdf1.geometry.values,
+                                         predicate='intersects')
+        geoms = shapely.intersection(gdf1.geometry.values[left_idx],
+                                     gdf2.geometry.values[right_idx])
+
+        left = gdf1.iloc[left_idx].drop(columns='geometry').reset_index(drop=True)
+        right = gdf2.iloc[right_idx].drop(columns='geometry').reset_index(drop=True)
+        shared = set(left.columns) & set(right.columns)
+        if shared:
+            left = left.rename(columns={c: f'{c}_1' for c in shared})
+            right = right.rename(columns={c: f'{c}_2' for c in shared})
+        intersected_gdf = gpd.GeoDataFrame(pd.concat([left, right], axis=1),
+                                           geometry=geoms, crs=gdf1.crs)
+        writeVector(intersected_gdf, outputPath)
+
+    def done(_):
+        QMessageBox.information(window, "Success", "Intersection operation completed!")
+        loadVector(outputPath)
+
+    runInBackground(work, done, "Intersection operation failed")
+
+
+def ndviDialog():
+    performRasterCalculation("NDVI", calculateNDVI)
+
+
+def ndbiDialog():
+    performRasterCalculation("NDBI", calculateNDBI)
+
+
+def lstDialog():
+    performRasterCalculation("LST", calculateLST)
+
+
+def performRasterCalculation(toolName, calculationFunc):
+    showFormDialog(toolName, f"{toolName} Tool", [
+        ("Input Raster File:", 'Raster Files (*.tif *.tiff *.img)', False),
+        ("Band 1:", None, False),
+        ("Band 2:", None, False),
+        ("Output File:", 'Raster Files (*.tif *.tiff)', True),
+    ], f"Calculate {toolName}", calculationFunc)
+
+
+def normalizedDifference(a, b):
+    # In-place fallback: two temporaries instead of the four a naive
+    # (a - b) / (a + b) expression allocates.
+    out = a - b
+    tmp = a + b
+    out /= tmp
+    return out
+
+
+def surfaceTemperature(t, _):
+    out = t * np.float32(0.00341802)
+    out += np.float32(149.0 - 273.15)
+    return out
+
+
+# Registry mapping each raster tool to a numexpr expression (multithreaded,
+# no intermediates) and an in-place NumPy fallback used when numexpr is
+# not installed.
+RASTER_OPERATIONS = {
+    'NDVI': ('(a - b) / (a + b)', normalizedDifference),
+    'NDBI': ('(a - b) / (a + b)', normalizedDifference),
+    'LST': ('a * 0.00341802 + 149 - 273.15', surfaceTemperature),
+}
+
+
+def evaluateRasterOperation(toolName, data1, data2):
+    expression, fallback = RASTER_OPERATIONS[toolName]
+    if numba is not None and data2 is not None:
+        # NDVI/NDBI are both normalized differences; run the JIT kernel.
+        out = np.empty_like(data1)
+        _ndi(data1.ravel(), data2.ravel(), out.ravel())
+        return out
+    if numexpr is not None:
+        # Evaluate into a float32 buffer: numexpr upcasts float32 mixed
+        # with Python-float constants to float64, which the float32 output
+        # profile would reject at write time.
+        out = np.empty_like(data1)
+        numexpr.evaluate(expression, local_dict={'a': data1, 'b': data2},
+                         out=out)
+        return out
+    return fallback(data1, data2)
+
+
+def calculateNDVI(rasterFile, redBand, nirBand, outputFile):
+    calculateRasterIndex(rasterFile, redBand, nirBand, outputFile, 'NDVI')
+
+
+def calculateNDBI(rasterFile, swirBand, nirBand, outputFile):
+    calculateRasterIndex(rasterFile, swirBand, nirBand, outputFile, 'NDBI')
+
+
+def calculateLST(rasterFile, thermalBand, _, outputFile):
+    calculateRasterIndex(rasterFile, thermalBand, None, outputFile, 'LST')
+
+
+def rasterOverlayDialog():
+    showFormDialog('overlay', "Raster Overlay Tool", [
+        ("Land Surface Temperature (LST) File:", 'Raster Files (*.tif *.tiff *.img)', False),
+        ("Normalized Difference Vegetation Index (NDVI) File:", 'Raster Files (*.tif *.tiff *.img)', False),
+        ("Normalized Difference Built-up Index (NDBI) File:", 'Raster Files (*.tif *.tiff *.img)', False),
+        ("Output File:", 'Raster Files (*.tif *.tiff)', True),
+    ], "Calculate Overlay", calculateOverlay)
+
+
+def calculateOverlay(lstFile, ndviFile, ndbiFile, outputFile):
+    def work():
+        with rasterio.open(lstFile) as lst_src, rasterio.open(ndviFile) as ndvi_src, rasterio.open(ndbiFile) as ndbi_src:
+            if not (lst_src.shape == ndvi_src.shape == ndbi_src.shape):
+                raise ValueError("Input rasters must have the same dimensions")
+            if not (lst_src.transform == ndvi_src.transform == ndbi_src.transform):
+                raise ValueError("Input rasters must have the same transform")
+
+            profile = lst_src.profile
+            profile.update(dtype=rasterio.float32)
+
+            with rasterio.open(outputFile, 'w', **profile) as dst:
+                # Stream block-sized tiles instead of materializing all three
+                # scenes in RAM; peak memory stays at a few blocks regardless
+                # of scene size.
+                for _, win in lst_src.block_windows(1):
+                    lst_data = lst_src.read(1, window=win, out_dtype='float32')
+                    ndvi_data = ndvi_src.read(1, window=win, out_dtype='float32')
+                    ndbi_data = ndbi_src.read(1, window=win, out_dtype='float32')
+
+                    # UHI = LST - (NDVI + NDBI) / 2
+                    if numba is not None:
+                        uhi_data = np.empty_like(lst_data)
+                        _uhi(lst_data.ravel(), ndvi_data.ravel(),
+                             ndbi_data.ravel(), uhi_data.ravel())
+                    else:
+                        tmp = np.add(ndvi_data, ndbi_data)
+                        tmp *= np.float32(0.5)
+                        uhi_data = np.subtract(lst_data, tmp, out=tmp)
+
+                    dst.write(uhi_data, 1, window=win)
+
+    def done(_):
+        QMessageBox.information(window, "Success", f"UHI calculation completed: {outputFile}")
+        loadRaster(outputFile)
+
+    runInBackground(work, done, "UHI calculation failed")
+
+def calculateRasterIndex(rasterFile, band1, band2, outputFile, toolName):
+    def work():
+        b1, b2 = int(band1), int(band2) if band2 else None
+        with rasterio.open(rasterFile) as src:
+            # One GDAL dispatch for both bands; out_dtype converts inside
+            # GDAL, or skips the copy entirely when the source is already
+            # float32.
+            if b2:
+                arr = src.read(indexes=[b1, b2], out_dtype='float32')
+                data1, data2 = arr[0], arr[1]
+            else:
+                data1 = src.read(b1, out_dtype='float32')
+                data2 = None
+            result = evaluateRasterOperation(toolName, data1, data2)
+            profile = src.profile
+            profile.update(dtype=rasterio.float32)
+
+            with rasterio.open(outputFile, 'w', **profile) as dst:
+                dst.write(result, 1)
+        return result, profile
+
+    def done(payload):
+        arr, profile = payload
+        QMessageBox.information(window, "Success", f"Calculation completed: {outputFile}")
+        loadRasterArray(os.path.basename(outputFile), arr, profile)
+
+    runInBackground(work, done, "Calculation failed")
+
+
+def browseFile(lineEdit, fileFilter, save=False):
+    dialogFunc = QFileDialog.getSaveFileName if save else QFileDialog.getOpenFileName
+    filePath, _ = dialogFunc(window, "Select File", "", fileFilter)
+    if filePath:
+        lineEdit.setText(filePath)
+
+
+def connectToDatabase():
+    dialog = QDialog(window)
+    dialog.setWindowTitle("Connect to Database")
+
+    layout = QFormLayout(dialog)
+
+    # Database connection fields
+    hostLabel = QLabel("Host:")
+    hostLineEdit = QLineEdit()
+    layout.addRow(hostLabel, hostLineEdit)
+
+    portLabel = QLabel("Port:")
+    portLineEdit = QLineEdit()
+    layout.addRow(portLabel, portLineEdit)
+
+    dbLabel = QLabel("Database:")
+    dbLineEdit = QLineEdit()
+    layout.addRow(dbLabel, dbLineEdit)
+
+    userLabel = QLabel("User:")
+    userLineEdit = QLineEdit()
+    layout.addRow(userLabel, userLineEdit)
+
+    passLabel = QLabel("Password:")
+    passLineEdit = QLineEdit()
+    passLineEdit.setEchoMode(QLineEdit.Password)
+    layout.addRow(passLabel, passLineEdit)
+
+    # Connect button
+    connectButton = QPushButton("Connect")
+    connectButton.clicked.connect(lambda: connectDatabase(
+        hostLineEdit.text(),
+        portLineEdit.text(),
+        dbLineEdit.text(),
+        userLineEdit.text(),
+        passLineEdit.text()
+    ))
+    layout.addRow("", connectButton)
+
+    dialog.setLayout(layout)
+    dialog.exec_()
+
+
+def connectDatabase(host, port, database, user, password):
+    try:
+        global dbConnection
+        dbConnection = psycopg2.connect(
+            host=host,
+            port=port,
+            database=database,
+            user=user,
+            password=password
+        )
+        QMessageBox.information(window, "Success", "Connected to the database successfully!")
+    except Exception as e:
+        QMessageBox.critical(window, "Error", f"Failed to connect to the database:\n{e}")
+
+
+def importFromDatabase():
+    if not 'dbConnection' in globals() or dbConnection.closed:
+        QMessageBox.warning(window, "Database Error", "Please connect to a database first!")
+        return
+
+    dialog = QDialog(window)
+    dialog.setWindowTitle("Import from Database")
+
+    layout = QFormLayout(dialog)
+
+    # Table selection
+    tableLabel = QLabel("Table Name:")
+    tableLineEdit = QLineEdit()
+    layout.addRow(tableLabel, tableLineEdit)
+
+    # Import button
+    importButton = QPushButton("Import")
+    importButton.clicked.connect(lambda: loadDataFromDatabase(tableLineEdit.text()))
+    layout.addRow("", importButton)
+
+    dialog.setLayout(layout)
+    dialog.exec_()
+
+
+# Cap on rows pulled in a single import; the viewport filter narrows the
+# result further when a view extent is available.
+MAX_DB_FEATURES = 100000
+
+
+def currentViewportBounds():
+    # Bounding box of the current view in data coordinates. Only meaningful
+    # when the layer actually on display is a vector one; raster views use
+    # pixel coordinates that have no relation to the database geometries.
+    if not vectorArtists:
+        return None
+    ax = canvas.figure.gca()
+    (xmin, xmax), (ymin, ymax) = ax.get_xlim(), ax.get_ylim()
+    return (min(xmin, xmax), min(ymin, ymax),
+            max(xmin, xmax), max(ymin, ymax))
+
+
+def loadDataFromDatabase(tableName):
+    if not tableName:
+        QMessageBox.warning(window, "Input Error", "Table name cannot be empty!")
+        return
+
+    # Quote the table name server-side instead of interpolating it into
+    # the SQL string, and push the viewport down as a bounding-box filter
+    # so only visible rows cross the wire. The bbox comes from the main
+    # thread; the query itself runs in the worker.
+    bbox = currentViewportBounds()
+
+    def work():
+        if bbox is not None:
+            # The envelope must carry the table's SRID or PostGIS treats
+            # it as SRID 0 and the && comparison is wrong (or raises on
+            # SRID-checked paths).
+            with dbConnection.cursor() as cur:
+                cur.execute("SELECT Find_SRID(%s, %s, %s)",
+                            ('public', tableName, 'geom'))
+                srid = cur.fetchone()[0]
+            query = sql.SQL(
+                "SELECT * FROM {} WHERE geom && ST_MakeEnvelope(%s, %s, %s, %s, %s) LIMIT %s"
+            ).format(sql.Identifier(tableName))
+            params = bbox + (srid, MAX_DB_FEATURES)
+        else:
+            query = sql.SQL("SELECT * FROM {} LIMIT %s").format(sql.Identifier(tableName))
+            params = (MAX_DB_FEATURES,)
+        return gpd.read_postgis(query.as_string(dbConnection), dbConnection,
+                                geom_col="geom", params=params)
+
+    def done(gdf):
+        layers[tableName] = {"type": "vector", "data": gdf}
+        updateTOC()
+        QMessageBox.information(window, "Success", f"Data imported from table: {tableName}")
+
+    runInBackground(work, done, "Failed to import data")
+
+
+
+def showHelp():
+    QMessageBox.information(window, "Help", "This is a simple GIS application. Use the File menu to open, save, or connect to a database. The Geoprocessing menu contains tools for buffer, clip, and intersect operations. The Toolbox menu contains tools for NDVI, NDBI,LST, Raster Overlay calculations.")
+
+
+
+# Initialize and run the application
+initUI()
+sys.exit(app.exec_())